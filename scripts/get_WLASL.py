@@ -1,9 +1,23 @@
 import fiftyone as fo
 import fiftyone.utils.huggingface as fouh
 import os
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+from tqdm import tqdm
+from urllib3.util.retry import Retry
 
 python_version = r" C:\Users\Sreek\AppData\Local\Programs\Python\Python310\python.exe"
+
+# Number of concurrent downloads; kept modest so remote hosts don't start returning 500s
+MAX_WORKERS = 12
+CHUNK_SIZE = 1 << 16
+
+# Files larger than this are fetched as RANGE_WORKERS parallel byte ranges
+RANGE_THRESHOLD = 4 << 20
+RANGE_WORKERS = 6
+
 # Load WLASL dataset from Hugging Face
 print("Loading WLASL from Hugging Face...")
 dataset = fouh.load_from_hub("Voxel51/WLASL")
@@ -13,16 +27,111 @@ dataset = fouh.load_from_hub("Voxel51/WLASL")
 # Create output directory for videos
 os.makedirs("data/raw_videos", exist_ok=True)
 
-# Loop through FiftyOne samples to download videos
-for sample in dataset:
-    gloss = sample["gloss"]
-    url = sample["video"]
-    instance_id = sample["instance_id"]
-    out_path = f"data/raw_videos/{gloss}_{instance_id}.mp4"
-
-    if not os.path.exists(out_path):
-        try:
-            print(f"Downloading: {gloss} (instance {instance_id})")
-            urllib.request.urlretrieve(url, out_path)
-        except Exception as e:
-            print(f"Failed to download {url}: {e}")
+# One shared session so Keep-Alive connections are reused across downloads,
+# with backoff retries for transient failures and rate limiting
+session = requests.Session()
+retries = Retry(total=5, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+adapter = HTTPAdapter(
+    pool_connections=MAX_WORKERS,
+    pool_maxsize=MAX_WORKERS + RANGE_WORKERS,
+    max_retries=retries
+)
+session.mount("http://", adapter)
+session.mount("https://", adapter)
+
+# Shared by all large files so the total number of connections stays bounded
+range_pool = ThreadPoolExecutor(max_workers=RANGE_WORKERS)
+
+
+def ranged_size(url):
+    """Return (final_url, size) if the server serves byte ranges of url, else None."""
+    try:
+        response = session.head(url, allow_redirects=True, timeout=30)
+    except requests.RequestException:
+        return None
+    size = int(response.headers.get("Content-Length", 0))
+    if response.ok and response.headers.get("Accept-Ranges") == "bytes" and size:
+        return response.url, size
+    return None
+
+
+def download_stream(url, path):
+    """Download url into path over a single connection."""
+    with session.get(url, stream=True, timeout=30) as response:
+        response.raise_for_status()
+        with open(path, "wb") as f:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                f.write(chunk)
+
+
+def download_range(url, fd, start, end):
+    """Fetch bytes [start, end] of url and write them at their offset in fd."""
+    headers = {"Range": f"bytes={start}-{end}"}
+    with session.get(url, headers=headers, stream=True, timeout=30) as response:
+        if response.status_code != 206:
+            raise IOError(f"Range request returned HTTP {response.status_code}")
+        offset = start
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            os.pwrite(fd, chunk, offset)
+            offset += len(chunk)
+    if offset != end + 1:
+        raise IOError(f"Range {start}-{end} ended early at byte {offset}")
+
+
+def download_ranged(url, path, size):
+    """Download url into a pre-sized file at path using parallel byte ranges."""
+    step = -(-size // RANGE_WORKERS)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.ftruncate(fd, size)
+        futures = [
+            range_pool.submit(download_range, url, fd, start, min(start + step, size) - 1)
+            for start in range(0, size, step)
+        ]
+        # Every range must finish writing before the descriptor is closed
+        wait(futures)
+        for future in futures:
+            future.result()
+    finally:
+        os.close(fd)
+
+
+def fetch(gloss, url, instance_id):
+    """Download the video of one sample, returning (gloss, instance_id, ok)."""
+    filename = f"{gloss}_{instance_id}.mp4"
+    out_path = f"data/raw_videos/{filename}"
+
+    if filename in existing:
+        return gloss, instance_id, True
+
+    # Stream into a temp file and rename, so a failed download never leaves a partial .mp4
+    tmp_path = out_path + ".part"
+    try:
+        # os.pwrite is POSIX only, elsewhere every file goes through a single stream
+        ranged = ranged_size(url) if hasattr(os, "pwrite") else None
+        if ranged and ranged[1] > RANGE_THRESHOLD:
+            download_ranged(ranged[0], tmp_path, ranged[1])
+        else:
+            download_stream(url, tmp_path)
+        os.replace(tmp_path, out_path)
+        return gloss, instance_id, True
+    except Exception as e:
+        tqdm.write(f"Failed to download {url}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return gloss, instance_id, False
+
+
+# Fetch the fields of all samples in one bulk query instead of one per sample
+glosses, urls, instance_ids = dataset.values(["gloss", "video", "instance_id"])
+
+# List the output directory once rather than checking every file separately
+existing = {entry.name for entry in os.scandir("data/raw_videos")}
+
+# Download videos concurrently, the work is network bound
+with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+    results = list(tqdm(ex.map(fetch, glosses, urls, instance_ids), total=len(urls), desc="Downloading"))
+range_pool.shutdown()
+
+failed = sum(1 for _, _, ok in results if not ok)
+print(f"Downloaded {len(results) - failed}/{len(results)} videos ({failed} failed)")
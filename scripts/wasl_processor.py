@@ -1,24 +1,127 @@
 import os
+import sys
 import json
+import queue
 import subprocess
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import pandas as pd
 from pathlib import Path
 from tqdm import tqdm
 import yt_dlp
 import cv2
-from moviepy import VideoFileClip
+import av
 import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import zipfile
 import shutil
 
+try:
+    import orjson
+except ImportError:  # optional, falls back to the json module
+    orjson = None
+    
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional, metadata is then indexed in memory from JSON
+    pa = pq = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Shared HTTP session, reusing keep-alive connections and retrying transient failures
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_maxsize=32,
+    max_retries=Retry(total=5, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+
+# Started OpenPose instances by installation path, kept for the life of the process
+# so the model load and GPU initialisation are paid once, not once per video.
+# Worker processes only decode frames, so OpenPose is loaded once per run
+_openpose_instances = {}
+
+# Queue worker processes put decoded frame batches on for OpenPose in the main process
+_batch_queue = None
+
+def _init_worker(batch_queue):
+    global _batch_queue
+    _batch_queue = batch_queue
+    
+def _decode_one(video_path, word_timestamps, info, output_dir, options):
+    """Decode the word segments of one video inside a worker process.
+    
+    Every frame batch is put on the batch queue as (video_path, batch, None),
+    followed by (video_path, None, error) once the video is done, where error
+    is None on success.
+    """
+    processor = WASLProcessor(output_dir, **options)
+    try:
+        # The manager queue pickles each batch on put, so a single buffer is reused
+        for batch in processor._frame_batches(video_path, word_timestamps, info, num_buffers=1):
+            _batch_queue.put((video_path, batch, None))
+    except Exception as e:
+        _batch_queue.put((video_path, None, str(e)))
+    else:
+        _batch_queue.put((video_path, None, None))
+
+class FrameBatcher:
+    """Collect frames into batches of batch_size frames of shape (H, W, 3).
+    
+    Frames that need resizing are resized straight into a slot of a preallocated
+    uint8[batch_size, H, W, 3] buffer with cv2.resize(dst=...). Frames already at
+    the target size are batched as they are, without a copy. Buffers are
+    allocated on the first resize and reused round-robin, so a returned batch
+    stays valid until num_buffers - 1 further batches have been filled.
+    """
+    
+    def __init__(self, batch_size=32, shape=(368, 656, 3), num_buffers=2):
+        self.batch_size = batch_size
+        self.shape = shape
+        self.num_buffers = num_buffers
+        self._buffers = None
+        self._current = 0
+        self._frames = []
+        self._payloads = []
+        
+    def add(self, frame, payload):
+        """Add a frame and its payload, returning a (frames, payloads) batch once full."""
+        height, width = self.shape[:2]
+        if frame.shape[:2] != (height, width):
+            if self._buffers is None:
+                self._buffers = [np.empty((self.batch_size, *self.shape), dtype=np.uint8)
+                                 for _ in range(self.num_buffers)]
+            slot = self._buffers[self._current][len(self._frames)]
+            frame = cv2.resize(frame, (width, height), dst=slot, interpolation=cv2.INTER_AREA)
+            
+        self._frames.append(frame)
+        self._payloads.append(payload)
+        if len(self._frames) == self.batch_size:
+            return self.flush()
+        return None
+        
+    def flush(self):
+        """Return the pending (frames, payloads) batch, or None if it is empty."""
+        if not self._frames:
+            return None
+        batch = (self._frames, self._payloads)
+        if self._buffers is not None:
+            self._current = (self._current + 1) % self.num_buffers
+        self._frames = []
+        self._payloads = []
+        return batch
+
 class WASLProcessor:
-    def __init__(self, output_dir="data/wasl_processed"):
+    def __init__(self, output_dir="data/wasl_processed", pose_fps=None, batch_size=8, prefetch=8,
+                 pose_input_size=None, pose_max_height=368, decode_threads=None):
         self.output_dir = Path(output_dir)
         self.videos_dir = self.output_dir / "videos"
         self.pose_dir = self.output_dir / "poses"
@@ -32,8 +135,29 @@ class WASLProcessor:
         # OpenPose path - update this to your OpenPose installation
         self.openpose_path = Path("path/to/openpose")
         
-        # Load metadata cache
-        self.metadata_cache = {}
+        # Frame rate to run OpenPose at, None keeps every source frame
+        self.pose_fps = pose_fps
+        
+        # Frames per OpenPose call, and queue depth between pipeline stages
+        self.batch_size = batch_size
+        self.prefetch = prefetch
+        
+        # (width, height) frames are resized to before OpenPose, None keeps the source size
+        self.pose_input_size = pose_input_size
+        
+        # Without pose_input_size, taller frames are scaled down to this height keeping their
+        # aspect ratio, OpenPose runs its network at 368 pixels high by default anyway
+        self.pose_max_height = pose_max_height
+        
+        # Decoder threads per video, None uses every core
+        self.decode_threads = decode_threads
+        
+        # Metadata entries indexed by video_id, loaded on first use
+        self._by_video_id = None
+        
+        # Video properties by path, persisted in metadata/probe_cache.json
+        self._probe_cache = None
+        self._probe_cache_dirty = False
         
     def get_WASL(self, dataset_url=None):
         """
@@ -53,19 +177,8 @@ class WASLProcessor:
             zip_path = self.raw_data_dir / "WASL.zip"
             logger.info(f"Downloading WASL dataset from {dataset_url}")
             
-            response = requests.get(dataset_url, stream=True)
-            total_size = int(response.headers.get('content-length', 0))
+            self._download_resumable(dataset_url, zip_path)
             
-            with open(zip_path, 'wb') as f, tqdm(
-                desc="Downloading",
-                total=total_size,
-                unit='iB',
-                unit_scale=True
-            ) as pbar:
-                for data in response.iter_content(chunk_size=1024):
-                    size = f.write(data)
-                    pbar.update(size)
-                    
             # Extract the dataset
             logger.info("Extracting WASL dataset...")
             with zipfile.ZipFile(zip_path, 'r') as zip_ref:
@@ -76,12 +189,58 @@ class WASLProcessor:
             
             # Clean up
             zip_path.unlink()
+            zip_path.with_name(zip_path.name + ".validator").unlink(missing_ok=True)
             logger.info("WASL dataset download and processing completed!")
             
         except Exception as e:
             logger.error(f"Error downloading or processing WASL dataset: {str(e)}")
             raise
             
+    def _download_resumable(self, url, path):
+        """Download url to path, resuming a previous partial download when possible.
+        
+        The ETag (or Last-Modified) of the response is kept next to the file. A
+        later call asks only for the missing bytes with Range, guarded by
+        If-Range, so the server sends the whole file again if it has changed.
+        """
+        validator_path = path.with_name(path.name + ".validator")
+        headers = {}
+        resume_from = 0
+        if path.exists() and validator_path.exists():
+            resume_from = path.stat().st_size
+            headers = {'Range': f'bytes={resume_from}-', 'If-Range': validator_path.read_text()}
+            
+        with SESSION.get(url, headers=headers, stream=True, timeout=30) as response:
+            if response.status_code == 416:
+                # Nothing left to fetch, the previous download had completed
+                logger.info(f"{path.name} already fully downloaded")
+                return
+            response.raise_for_status()
+            
+            if response.status_code != 206:
+                # Server sent the whole file, either fresh or because it changed
+                resume_from = 0
+            else:
+                logger.info(f"Resuming download of {path.name} at byte {resume_from}")
+                
+            validator = response.headers.get('ETag') or response.headers.get('Last-Modified')
+            if validator:
+                validator_path.write_text(validator)
+            else:
+                validator_path.unlink(missing_ok=True)
+                
+            total_size = resume_from + int(response.headers.get('content-length', 0))
+            with open(path, 'ab' if resume_from else 'wb') as f, tqdm(
+                desc="Downloading",
+                total=total_size,
+                initial=resume_from,
+                unit='iB',
+                unit_scale=True
+            ) as pbar:
+                for data in response.iter_content(chunk_size=1024 * 1024):
+                    size = f.write(data)
+                    pbar.update(size)
+                    
     def _process_WASL_structure(self):
         """Process the extracted WASL dataset structure and create metadata."""
         logger.info("Processing WASL dataset structure...")
@@ -126,20 +285,78 @@ class WASLProcessor:
             
         logger.info(f"Processed {len(metadata)} entries from WASL dataset")
         
-    def _get_word_timestamps(self, video_id):
-        """Extract word timestamps from metadata for a given video."""
-        if video_id not in self.metadata_cache:
-            # Load metadata if not in cache
-            metadata_path = self.metadata_dir / "wasl_metadata.json"
-            if not metadata_path.exists():
-                raise FileNotFoundError("WASL metadata file not found")
+    def _load_json(self, path):
+        """Parse a JSON file, using orjson when it is installed."""
+        if orjson is not None:
+            with open(path, 'rb') as f:
+                return orjson.loads(f.read())
+        with open(path, 'r') as f:
+            return json.load(f)
+            
+    def _convert_metadata_to_parquet(self):
+        """Write a Parquet copy of the metadata, sorted so row groups cover few videos."""
+        metadata = self._load_json(self.metadata_dir / "wasl_metadata.json")
+        metadata.sort(key=lambda entry: entry['video_id'])
+        
+        schema = pa.schema([
+            ('video_id', pa.string()),
+            ('word', pa.string()),
+            ('start_time', pa.float64()),
+            ('end_time', pa.float64())
+        ])
+        table = pa.Table.from_pylist(metadata, schema=schema)
+        
+        parquet_path = self.metadata_dir / "wasl_metadata.parquet"
+        tmp_path = parquet_path.with_suffix(".parquet.tmp")
+        pq.write_table(table, tmp_path, row_group_size=4096)
+        os.replace(tmp_path, parquet_path)
+        
+    def _metadata_parquet_path(self):
+        """Return the Parquet metadata, regenerating it when the JSON file is newer."""
+        metadata_path = self.metadata_dir / "wasl_metadata.json"
+        parquet_path = self.metadata_dir / "wasl_metadata.parquet"
+        if not metadata_path.exists():
+            raise FileNotFoundError("WASL metadata file not found")
+            
+        if not parquet_path.exists() or parquet_path.stat().st_mtime < metadata_path.stat().st_mtime:
+            logger.info("Converting WASL metadata to Parquet...")
+            self._convert_metadata_to_parquet()
+        return parquet_path
+        
+    def _metadata_index(self):
+        """Return the metadata indexed by video_id, loading it on first use.
+        
+        With pyarrow installed the index is built from one read of the Parquet
+        copy, otherwise from the JSON file.
+        """
+        if self._by_video_id is None:
+            if pq is not None:
+                entries = pq.read_table(self._metadata_parquet_path()).to_pylist()
+            else:
+                metadata_path = self.metadata_dir / "wasl_metadata.json"
+                if not metadata_path.exists():
+                    raise FileNotFoundError("WASL metadata file not found")
+                entries = self._load_json(metadata_path)
                 
-            with open(metadata_path, 'r') as f:
-                self.metadata_cache = json.load(f)
+            self._by_video_id = {}
+            for entry in entries:
+                self._by_video_id.setdefault(entry['video_id'], []).append(entry)
                 
+        return self._by_video_id
+        
+    def _get_word_timestamps(self, video_id):
+        """Extract word timestamps from metadata for a given video.
+        
+        Lookups go through the in-memory index once it is loaded. Before that,
+        with pyarrow installed, only the rows of this video are read from a
+        Parquet copy of the metadata, so one-off lookups skip building the index.
+        """
         # Find entries for this video
-        video_entries = [entry for entry in self.metadata_cache 
-                        if entry['video_id'] == video_id]
+        if self._by_video_id is None and pq is not None:
+            table = pq.read_table(self._metadata_parquet_path(), filters=[('video_id', '=', video_id)])
+            video_entries = table.to_pylist()
+        else:
+            video_entries = self._metadata_index().get(video_id, [])
         
         if not video_entries:
             logger.warning(f"No metadata found for video {video_id}")
@@ -159,98 +376,529 @@ class WASLProcessor:
         """Download videos from WASL dataset using metadata."""
         logger.info("Starting WASL video downloads...")
         
-        with open(wasl_metadata_path, 'r') as f:
-            metadata = json.load(f)
+        metadata = self._load_json(wasl_metadata_path)
+            
+        # Only hand yt-dlp the videos that are still missing, each once
+        video_ids = dict.fromkeys(entry['video_id'] for entry in metadata)
+        urls = [f"https://www.youtube.com/watch?v={video_id}" for video_id in video_ids
+                if not (self.videos_dir / f"{video_id}.mp4").exists()]
+        if not urls:
+            logger.info("All WASL videos already downloaded")
+            return
             
         ydl_opts = {
             'format': 'best[height<=720]',  # Limit to 720p
             'outtmpl': str(self.videos_dir / '%(id)s.%(ext)s'),
             'quiet': True,
-            'no_warnings': True
+            'no_warnings': True,
+            'ignoreerrors': True,  # Keep going when a single video fails
+            'concurrent_fragment_downloads': 8,
+            'fragment_retries': 3
         }
         
+        logger.info(f"Downloading {len(urls)} videos...")
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            for entry in tqdm(metadata, desc="Downloading videos"):
-                try:
-                    video_id = entry['video_id']
-                    if not (self.videos_dir / f"{video_id}.mp4").exists():
-                        ydl.download([f"https://www.youtube.com/watch?v={video_id}"])
-                except Exception as e:
-                    logger.error(f"Error downloading video {video_id}: {str(e)}")
+            if ydl.download(urls) != 0:
+                logger.error("Some WASL videos could not be downloaded")
                     
-    def split_video_into_words(self, video_path, word_timestamps):
-        """Split video into individual word segments."""
-        video = VideoFileClip(str(video_path))
-        word_clips = []
+    def split_video_into_words(self, video_path, word_timestamps, reencode=False):
+        """Split video into individual word segments.
         
-        for word, (start, end) in word_timestamps.items():
-            clip = video.subclip(start, end)
+        All segments are cut by a single ffmpeg invocation using stream copy,
+        so nothing is re-encoded. Each segment is opened as its own input with
+        -ss/-to placed before -i, which makes ffmpeg seek straight to it.
+        
+        With reencode=True the segments are encoded with libx264 instead, which
+        gives frame-accurate cuts. The source is then opened and decoded once and
+        every segment is an output of that same invocation.
+        """
+        word_clips = []
+        if not word_timestamps:
+            return word_clips
+            
+        cmd = ["ffmpeg", "-y", "-loglevel", "error"]
+        if reencode:
+            cmd += ["-i", str(video_path)]
+        else:
+            for start, end in word_timestamps.values():
+                cmd += ["-ss", str(start), "-to", str(end), "-i", str(video_path)]
+                
+        for index, (word, (start, end)) in enumerate(word_timestamps.items()):
             output_path = self.videos_dir / f"{video_path.stem}_{word}.mp4"
-            clip.write_videofile(str(output_path), codec='libx264', audio=False)
+            if reencode:
+                cmd += [
+                    "-map", "0:v:0",
+                    "-ss", str(start), "-to", str(end),
+                    "-c:v", "libx264", "-preset", "ultrafast",
+                    "-an",
+                    str(output_path)
+                ]
+            else:
+                cmd += [
+                    "-map", f"{index}:v:0",
+                    "-c", "copy",
+                    "-avoid_negative_ts", "make_zero",
+                    str(output_path)
+                ]
             word_clips.append((word, output_path))
             
-        video.close()
+        subprocess.run(cmd, check=True)
         return word_clips
         
-    def process_with_openpose(self, video_path):
-        """Process video with OpenPose to generate pose data."""
-        output_path = self.pose_dir / f"{video_path.stem}.json"
+    def _get_openpose(self):
+        """Start the OpenPose Python API on first use in this process and return (op, wrapper)."""
+        key = str(self.openpose_path)
+        if key not in _openpose_instances:
+            python_dir = str(self.openpose_path / "build/python")
+            if python_dir not in sys.path:
+                sys.path.append(python_dir)
+            try:
+                from openpose import pyopenpose as op
+            except ImportError as e:
+                raise ImportError(
+                    "OpenPose Python bindings not found, build OpenPose with -DBUILD_PYTHON=ON"
+                ) from e
+                
+            wrapper = op.WrapperPython()
+            wrapper.configure({
+                "model_folder": str(self.openpose_path / "models"),
+                "render_pose": 0
+            })
+            wrapper.start()
+            _openpose_instances[key] = (op, wrapper)
+            
+        return _openpose_instances[key]
         
-        # OpenPose command
-        cmd = [
-            str(self.openpose_path / "build/examples/openpose/openpose.bin"),
-            "--video", str(video_path),
-            "--write_json", str(self.pose_dir),
-            "--display", "0",
-            "--render_pose", "0"
-        ]
+    def _load_probe_cache(self):
+        """Return the video probe cache, reading it from disk on first use."""
+        if self._probe_cache is None:
+            cache_path = self.metadata_dir / "probe_cache.json"
+            self._probe_cache = self._load_json(cache_path) if cache_path.exists() else {}
+        return self._probe_cache
         
-        try:
-            subprocess.run(cmd, check=True)
-            logger.info(f"Processed {video_path} with OpenPose")
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Error processing {video_path} with OpenPose: {str(e)}")
+    def _save_probe_cache(self):
+        """Write the video probe cache to disk if new videos were probed."""
+        if not self._probe_cache_dirty:
+            return
+        cache_path = self.metadata_dir / "probe_cache.json"
+        tmp_path = cache_path.with_suffix(".json.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(self._probe_cache, f)
+        os.replace(tmp_path, cache_path)
+        self._probe_cache_dirty = False
+        
+    def _probe_video(self, video_path):
+        """Return fps, duration, width, height and nb_frames of a video's first stream.
+        
+        Results are cached per video and reused until its modification time changes.
+        """
+        cache = self._load_probe_cache()
+        key = str(video_path)
+        mtime = video_path.stat().st_mtime
+        if key in cache and cache[key]['mtime'] == mtime:
+            return cache[key]
             
-    def create_word_pose_mapping(self, metadata):
-        """Create mapping between words and their corresponding pose data."""
-        mapping = {}
+        with av.open(str(video_path)) as container:
+            stream = container.streams.video[0]
+            rate = stream.average_rate or stream.guessed_rate
+            if stream.duration is not None:
+                duration = float(stream.duration * stream.time_base)
+            else:
+                duration = (container.duration or 0) / av.time_base
+            info = {
+                'mtime': mtime,
+                'fps': float(rate),
+                'duration': duration,
+                'width': stream.codec_context.width,
+                'height': stream.codec_context.height,
+                'nb_frames': stream.frames
+            }
+            
+        cache[key] = info
+        self._probe_cache_dirty = True
+        return info
         
-        for entry in metadata:
-            word = entry['word']
-            video_id = entry['video_id']
-            pose_file = self.pose_dir / f"{video_id}.json"
+    def _decode_video_pyav(self, video_path, start, end, stride=1):
+        """Yield every stride-th BGR frame between start and end, decoded with PyAV.
+        
+        The decoder uses frame threading across decode_threads threads (all cores
+        by default). Every frame is decoded to keep the decoder in sync, but
+        only the sampled ones are converted to BGR arrays, so skipped frames
+        never pay for the colour conversion.
+        """
+        with av.open(str(video_path)) as container:
+            stream = container.streams.video[0]
+            stream.thread_type = 'FRAME'
+            stream.thread_count = self.decode_threads or os.cpu_count()
+            
+            # Word timestamps count from zero, frame times from the stream's first timestamp
+            offset = float(stream.start_time * stream.time_base) if stream.start_time is not None else 0
+            start, end = start + offset, end + offset
             
-            if pose_file.exists():
-                with open(pose_file, 'r') as f:
-                    pose_data = json.load(f)
-                mapping[word] = pose_data
+            # Seeks to the keyframe before start, frames up to start are decoded and dropped
+            container.seek(int(start / stream.time_base), stream=stream)
+            
+            frame_idx = 0
+            for frame in container.decode(stream):
+                if frame.time is not None and frame.time < start:
+                    continue
+                if frame.time is not None and frame.time >= end:
+                    break
+                if frame_idx % stride == 0:
+                    yield frame.to_ndarray(format='bgr24')
+                frame_idx += 1
                 
-        # Save mapping
-        with open(self.metadata_dir / "word_pose_mapping.json", 'w') as f:
-            json.dump(mapping, f, indent=2)
+    def _first_person(self, pose_keypoints):
+        """Return the keypoints of the first detected person, zeros when nobody was found."""
+        if pose_keypoints is None or pose_keypoints.ndim != 3 or len(pose_keypoints) == 0:
+            return np.zeros((25, 3), dtype=np.float32)
+        return pose_keypoints[0].astype(np.float32)
+        
+    def _save_pose_archive(self, video_id, word_frames):
+        """Save the keypoints of every word of a video as one compressed .npz archive.
+        
+        Keypoints are quantized for storage: xy holds the int16[num_frames, 25, 2]
+        pixel positions and conf the uint8[num_frames, 25] confidences scaled by
+        255. Frames of all words are stored back to back; the frames of words[i]
+        are xy[offsets[i]:offsets[i + 1]].
+        """
+        words = list(word_frames)
+        counts = [len(word_frames[word]) for word in words]
+        offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        
+        frames = [frame for word in words for frame in word_frames[word]]
+        if frames:
+            keypoints = np.stack(frames)
+        else:
+            keypoints = np.zeros((0, 25, 3), dtype=np.float32)
+            
+        xy = np.round(keypoints[..., :2]).astype(np.int16)
+        conf = np.round(np.clip(keypoints[..., 2], 0, 1) * 255).astype(np.uint8)
+        
+        np.savez_compressed(
+            self.pose_dir / f"{video_id}.npz",
+            xy=xy,
+            conf=conf,
+            words=np.array(words, dtype=str),
+            offsets=offsets
+        )
+        
+    def _load_pose_archive(self, pose_file):
+        """Load a video's pose archive as a dict of word -> float32[num_frames, 25, 3]."""
+        with np.load(pose_file) as archive:
+            xy = archive['xy']
+            conf = archive['conf']
+            words = archive['words']
+            offsets = archive['offsets']
             
-    def process_dataset(self, wasl_metadata_path):
-        """Main pipeline to process the entire WASL dataset."""
+        # Dequantize back to OpenPose's (x, y, confidence) layout
+        keypoints = np.concatenate([
+            xy.astype(np.float32),
+            conf[..., np.newaxis].astype(np.float32) / 255
+        ], axis=-1)
+        return {str(word): keypoints[offsets[i]:offsets[i + 1]] for i, word in enumerate(words)}
+        
+    def _estimate_poses(self, frames):
+        """Run OpenPose on a batch of frames and return the pose keypoints of each."""
+        op, wrapper = self._get_openpose()
+        datums = []
+        for frame in frames:
+            datum = op.Datum()
+            datum.cvInputData = frame
+            datums.append(datum)
+        wrapper.emplaceAndPop(op.VectorDatum(datums))
+        return [datum.poseKeypoints for datum in datums]
+            
+    def _frame_windows(self, word_timestamps, fps):
+        """Merge the frame ranges of overlapping or adjacent word segments.
+        
+        Returns a list of [first, end, words] frame ranges (end exclusive), each
+        decoded in a single pass, where words holds the (word, first, end) frame
+        window of every segment inside the range.
+        """
+        windows = sorted(
+            (int(start * fps), int(end * fps), word)
+            for word, (start, end) in word_timestamps.items()
+        )
+        
+        ranges = []
+        for first, end, word in windows:
+            if end <= first:
+                continue
+            if ranges and first <= ranges[-1][1]:
+                ranges[-1][1] = max(ranges[-1][1], end)
+                ranges[-1][2].append((word, first, end))
+            else:
+                ranges.append([first, end, [(word, first, end)]])
+        return ranges
+        
+    def _pose_input_size(self, info):
+        """Return the (width, height) a video's frames are passed to OpenPose at."""
+        if self.pose_input_size:
+            return self.pose_input_size
+        if self.pose_max_height and info['height'] > self.pose_max_height:
+            return round(info['width'] * self.pose_max_height / info['height']), self.pose_max_height
+        return info['width'], info['height']
+        
+    def _pose_scale(self, info):
+        """Return the (x, y, confidence) factors mapping OpenPose input pixels to source pixels."""
+        width, height = self._pose_input_size(info)
+        return np.array([info['width'] / width, info['height'] / height, 1], dtype=np.float32)
+        
+    def _pose_batch(self, batch, scale, word_frames):
+        """Run OpenPose on a (frames, targets) batch and append each frame's keypoints to its words."""
+        frames, targets = batch
+        keypoints = self._estimate_poses(frames)
+        for frame_targets, pose_keypoints in zip(targets, keypoints):
+            for word in frame_targets:
+                word_frames[word].append(self._first_person(pose_keypoints) * scale)
+                
+    def _frame_batches(self, video_path, word_timestamps, info, num_buffers=1):
+        """Decode the word segments of a video and yield (frames, targets) batches.
+        
+        targets holds, for each frame, the words whose segment contains it.
+        Frames are resized to _pose_input_size(info). Decoding errors are
+        raised, so a video is never saved with some of its frames missing.
+        num_buffers is the number of FrameBatcher buffers, one is enough when
+        each batch is copied before the next is filled.
+        """
+        fps = info['fps']
+        stride = max(1, round(fps / self.pose_fps)) if self.pose_fps else 1
+        width, height = self._pose_input_size(info)
+        batcher = FrameBatcher(self.batch_size, (height, width, 3), num_buffers=num_buffers)
+        
+        for first, end, words in self._frame_windows(word_timestamps, fps):
+            # Seek half a frame early so rounding never drops the first frame
+            start_time, end_time = max(first - 0.5, 0) / fps, (end - 0.5) / fps
+            frames = self._decode_video_pyav(video_path, start_time, end_time, stride)
+                
+            # Route each frame to every word whose window contains it
+            for frame_no, frame in zip(range(first, end, stride), frames):
+                targets = [word for word, word_first, word_end in words
+                           if word_first <= frame_no < word_end]
+                batch = batcher.add(frame, targets)
+                if batch is not None:
+                    yield batch
+                    
+        batch = batcher.flush()
+        if batch is not None:
+            yield batch
+            
+    def process_with_openpose(self, video_path, word_timestamps, info=None):
+        """Process the word segments of a video with OpenPose to generate pose data.
+        
+        Word segments are turned into frame windows and overlapping or adjacent
+        windows are merged, so each frame is decoded and run through OpenPose once
+        even when it belongs to several words. Frames are decoded without writing
+        intermediate clips: a reader thread decodes frames into batches (resized
+        into preallocated buffers when they are scaled down) and hands them over
+        a bounded queue to the calling thread, which runs OpenPose on each batch
+        and gathers the keypoints per word, in source video pixels. They are
+        saved as a single <video>.npz archive in pose_dir. info is the video's
+        _probe_video result, probed here when it is not given.
+        """
+        if info is None:
+            info = self._probe_video(video_path)
+        scale = self._pose_scale(info)
+        
+        read_q = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+        errors = []
+        word_frames = {word: [] for word in word_timestamps}
+        
+        def read_frames():
+            try:
+                # Enough buffers for every batch in the queue plus the ones being filled and posed
+                batches = self._frame_batches(video_path, word_timestamps, info, self.prefetch + 2)
+                for batch in batches:
+                    if stop.is_set():
+                        return
+                    read_q.put(batch)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                read_q.put(None)
+                
+        reader = threading.Thread(target=read_frames, daemon=True)
+        reader.start()
+        
+        reader_done = False
+        try:
+            while True:
+                batch = read_q.get()
+                if batch is None:
+                    reader_done = True
+                    break
+                    
+                self._pose_batch(batch, scale, word_frames)
+        finally:
+            if not reader_done:
+                # Unblock the reader so it sees the stop flag and exits
+                stop.set()
+                while read_q.get() is not None:
+                    pass
+            reader.join()
+            
+        if errors:
+            raise errors[0]
+        self._save_pose_archive(video_path.stem, word_frames)
+        logger.info(f"Processed {video_path} with OpenPose")
+        
+    def _dump_json_line(self, record):
+        """Serialize a record as one line of JSON Lines, using orjson when it is installed."""
+        if orjson is not None:
+            return orjson.dumps(record) + b"\n"
+        return json.dumps(record).encode() + b"\n"
+        
+    def create_word_pose_mapping(self, metadata):
+        """Create mapping between words and their corresponding pose data.
+        
+        The mapping is streamed to word_pose_mapping.jsonl as one {word: pose_data}
+        record per line, so only one video's pose data is held in memory at a time.
+        """
+        with open(self.metadata_dir / "word_pose_mapping.jsonl", 'wb') as f:
+            loaded_video_id, poses = None, {}
+            for entry in metadata:
+                word = entry['word']
+                video_id = entry['video_id']
+                
+                # Entries of a video are usually adjacent, so most archives are loaded once
+                if video_id != loaded_video_id:
+                    pose_file = self.pose_dir / f"{video_id}.npz"
+                    poses = self._load_pose_archive(pose_file) if pose_file.exists() else {}
+                    loaded_video_id = video_id
+                    
+                if word in poses:
+                    f.write(self._dump_json_line({word: poses[word].tolist()}))
+                    
+    def _pose_worker_batches(self, batch_q, futures, videos):
+        """Run OpenPose on the frame batches decoded by _decode_one workers.
+        
+        videos maps each submitted video path to its (word_timestamps, info).
+        Keypoints are gathered per video and saved once its worker reports the
+        video as done. A video that fails to decode or pose is logged and
+        skipped, so the rest of the dataset is still processed.
+        """
+        word_frames = {}
+        failed = set()
+        unfinished = set(videos)
+        with tqdm(total=len(unfinished), desc="Processing videos") as progress:
+            # Keep draining until every worker is done, so none blocks on a full queue
+            while unfinished:
+                try:
+                    video_path, batch, error = batch_q.get(timeout=5)
+                except queue.Empty:
+                    # Workers report their own errors, a failed future means the worker died
+                    for future, video_path in futures.items():
+                        if video_path in unfinished and future.done() and future.exception() is not None:
+                            logger.error(f"Error decoding {video_path} for OpenPose: {str(future.exception())}")
+                            unfinished.discard(video_path)
+                            progress.update()
+                    continue
+                    
+                if video_path not in unfinished:
+                    continue
+                    
+                word_timestamps, info = videos[video_path]
+                if batch is not None:
+                    if video_path in failed:
+                        continue
+                    try:
+                        poses = word_frames.setdefault(video_path, {word: [] for word in word_timestamps})
+                        self._pose_batch(batch, self._pose_scale(info), poses)
+                    except Exception as e:
+                        logger.error(f"Error processing {video_path} with OpenPose: {str(e)}")
+                        failed.add(video_path)
+                    continue
+                    
+                # The worker is done with this video
+                unfinished.discard(video_path)
+                progress.update()
+                poses = word_frames.pop(video_path, None) or {word: [] for word in word_timestamps}
+                if error is not None:
+                    logger.error(f"Error decoding {video_path} for OpenPose: {error}")
+                elif video_path not in failed:
+                    self._save_pose_archive(video_path.stem, poses)
+                    logger.info(f"Processed {video_path} with OpenPose")
+                    
+    def process_dataset(self, wasl_metadata_path, workers=None):
+        """Main pipeline to process the entire WASL dataset.
+        
+        Videos are decoded in parallel by a pool of worker processes (one per
+        CPU core unless workers is given), which only decode and batch frames.
+        OpenPose runs in this process alone, so a single model is loaded no
+        matter how many workers there are. Every batch is pickled through the
+        manager process on its way here, at about half the frame rate of a
+        plain pipe, so by default frames are scaled down to pose_max_height in
+        the workers before they are sent.
+        """
         logger.info("Starting WASL dataset processing...")
         
         # Download videos
         self.download_wasl_videos(wasl_metadata_path)
         
-        # Process each video
-        for video_path in tqdm(list(self.videos_dir.glob("*.mp4")), desc="Processing videos"):
-            # Get word timestamps from metadata
+        # Get word timestamps from metadata once, in the parent process, through
+        # the index rather than one filtered read per video. Videos without
+        # metadata have no word segments to pose and are skipped
+        self._metadata_index()
+        video_paths, timestamps, infos = [], [], []
+        for video_path in self.videos_dir.glob("*.mp4"):
             word_timestamps = self._get_word_timestamps(video_path.stem)
-            
-            # Split video into words
-            word_clips = self.split_video_into_words(video_path, word_timestamps)
-            
-            # Process each word clip with OpenPose
-            for word, clip_path in word_clips:
-                self.process_with_openpose(clip_path)
+            if not word_timestamps:
+                continue
+                
+            # Probe videos up front and hand each worker its probe result,
+            # skipping corrupt or partially downloaded ones
+            try:
+                infos.append(self._probe_video(video_path))
+            except Exception as e:
+                logger.error(f"Skipping unreadable video {video_path}: {str(e)}")
+                continue
+            video_paths.append(video_path)
+            timestamps.append(word_timestamps)
+        self._save_probe_cache()
+        
+        # Split the cores between the workers' decoders rather than giving each all of them
+        workers = workers or os.cpu_count()
+        options = {
+            'pose_fps': self.pose_fps,
+            'batch_size': self.batch_size,
+            'prefetch': self.prefetch,
+            'pose_input_size': self.pose_input_size,
+            'pose_max_height': self.pose_max_height,
+            'decode_threads': max(1, os.cpu_count() // workers)
+        }
+        
+        # Start OpenPose before decoding anything, so a missing or broken
+        # installation stops the run instead of failing every video
+        self._get_openpose()
+        
+        # Stream the word segments of each video from the workers through OpenPose.
+        # Batches go through a manager queue, where each worker has its own
+        # connection, so a worker dying mid-batch cannot corrupt the others' batches
+        with multiprocessing.Manager() as manager:
+            batch_q = manager.Queue(maxsize=self.prefetch)
+            with ProcessPoolExecutor(max_workers=workers,
+                                     initializer=_init_worker, initargs=(batch_q,)) as ex:
+                futures = {
+                    ex.submit(_decode_one, video_path, word_timestamps, info, self.output_dir,
+                              options): video_path
+                    for video_path, word_timestamps, info in zip(video_paths, timestamps, infos)
+                }
+                try:
+                    self._pose_worker_batches(batch_q, futures, dict(zip(video_paths, zip(timestamps, infos))))
+                finally:
+                    # After an error, drop the videos not started yet and keep draining the
+                    # queue so running workers are never left blocked on put
+                    ex.shutdown(wait=False, cancel_futures=True)
+                    while not all(future.done() for future in futures):
+                        try:
+                            batch_q.get(timeout=0.1)
+                        except queue.Empty:
+                            pass
                 
         # Create final word-pose mapping
-        with open(wasl_metadata_path, 'r') as f:
-            metadata = json.load(f)
+        metadata = self._load_json(wasl_metadata_path)
         self.create_word_pose_mapping(metadata)
         
         logger.info("WASL dataset processing completed!")